@@ -1,9 +1,70 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+from typing import List, Set, Tuple
+
+import anyio
+from fastapi import FastAPI, Request
 from pydantic import BaseModel
-from simplifier import EmailSimplifier
+from simplifier import EmailSimplifier, get_simplifier
+
+CONFIG_PATH = "config.yaml"
+MAX_BATCH_SIZE = 32
+MAX_BATCH_WAIT = 0.005  # seconds to wait for more requests before running a batch
+MAX_BATCH_THREADS = 4
+
+class MicroBatcher:
+    """Coalesce concurrent requests into simplify_batch calls run in a bounded threadpool."""
+
+    def __init__(self, simplifier: EmailSimplifier) -> None:
+        self.simplifier = simplifier
+        self._queue: "asyncio.Queue[Tuple[str, asyncio.Future]]" = asyncio.Queue()
+        self._limiter = anyio.CapacityLimiter(MAX_BATCH_THREADS)
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, text: str) -> str:
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + MAX_BATCH_WAIT
+            while len(batch) < MAX_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            task = asyncio.create_task(self._process(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _process(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        texts = [text for text, _ in batch]
+        try:
+            results = await anyio.to_thread.run_sync(self.simplifier.simplify_batch, texts, limiter=self._limiter)
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Reuses the instance built in the gunicorn master (see gunicorn.conf.py) when preloaded.
+    app.state.batcher = MicroBatcher(get_simplifier(CONFIG_PATH))
+    runner = asyncio.create_task(app.state.batcher.run())
+    yield
+    runner.cancel()
 
-app = FastAPI()
-simplifier = EmailSimplifier("config.yaml")
+app = FastAPI(lifespan=lifespan)
 
 class SimplifyRequest(BaseModel):
     text: str
@@ -12,5 +73,5 @@ class SimplifyResponse(BaseModel):
     simplified_text: str
 
 @app.post("/simplify-text", response_model=SimplifyResponse)
-def simplify(req: SimplifyRequest):
-    return SimplifyResponse(simplified_text=simplifier.simplify_text(req.text))
+async def simplify(req: SimplifyRequest, request: Request):
+    return SimplifyResponse(simplified_text=await request.app.state.batcher.submit(req.text))
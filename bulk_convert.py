@@ -1,20 +1,75 @@
-from pathlib import Path
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Tuple
 from simplifier import EmailSimplifier
 
-def bulk_convert(input_dir: str, output_dir: str, config_path: str = "config.yaml"):
-    simplifier = EmailSimplifier(config_path)
-    in_path = Path(input_dir)
-    out_path = Path(output_dir)
-    out_path.mkdir(parents=True, exist_ok=True)
-
-    for file in in_path.rglob("*"):
-        if file.is_file() and file.suffix.lower() in {".txt", ".md", ".html"}:
-            content = file.read_text(encoding="utf-8")
-            simplified = simplifier.simplify_text(content)
-            target = out_path / file.relative_to(in_path)
-            target.parent.mkdir(parents=True, exist_ok=True)
-            target.write_text(simplified, encoding="utf-8")
-            print(f"Converted {file} -> {target}")
+TEMPLATE_EXTENSIONS = {".txt", ".md", ".html"}
+BATCH_SIZE = 16
+
+# Per-process simplifier, built once by the pool initializer so each worker
+# pays the config load and rule compilation cost a single time.
+_simplifier: Optional[EmailSimplifier] = None
+
+def _init_worker(config_path: str) -> None:
+    global _simplifier
+    _simplifier = EmailSimplifier(config_path)
+
+def iter_files(root: str) -> Iterator[str]:
+    stack = [root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except PermissionError:
+            continue  # skip unreadable directories, as Path.rglob did
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file() and os.path.splitext(entry.name)[1].lower() in TEMPLATE_EXTENSIONS:
+                    yield entry.path
+
+def _read_text(path: str) -> str:
+    # Decode straight from the mapped pages instead of reading into an intermediate buffer.
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return str(view, "utf-8")
+
+def _write_text(path: str, text: str) -> None:
+    # Write to a temp file beside the target and swap it in, so readers never see a partial file.
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        try:
+            data = memoryview(text.encode("utf-8"))
+            while data:
+                data = data[os.write(fd, data):]
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def _convert_batch(jobs: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    # Jobs are grouped only to cut IPC round-trips; each file is read, simplified and
+    # written before the next is opened, so a worker holds one template at a time.
+    for file, target in jobs:
+        _write_text(target, _simplifier.simplify_text(_read_text(file)))
+    return jobs
+
+def bulk_convert(input_dir: str, output_dir: str, config_path: str = "config.yaml", workers: Optional[int] = None):
+    os.makedirs(output_dir, exist_ok=True)
+
+    jobs = [(file, os.path.join(output_dir, os.path.relpath(file, input_dir))) for file in iter_files(input_dir)]
+    batches = [jobs[i:i + BATCH_SIZE] for i in range(0, len(jobs), BATCH_SIZE)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(config_path,)) as executor:
+        for done in executor.map(_convert_batch, batches):
+            for file, target in done:
+                print(f"Converted {file} -> {target}")
 
 if __name__ == "__main__":
     import argparse
@@ -22,5 +77,6 @@ if __name__ == "__main__":
     parser.add_argument("--input", required=True)
     parser.add_argument("--output", required=True)
     parser.add_argument("--config", default="config.yaml")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count).")
     args = parser.parse_args()
-    bulk_convert(args.input, args.output, args.config)
+    bulk_convert(args.input, args.output, args.config, args.workers)
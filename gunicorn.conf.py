@@ -0,0 +1,12 @@
+# Multi-worker deployment: gunicorn -c gunicorn.conf.py api:app
+from simplifier import get_simplifier
+from api import CONFIG_PATH
+
+bind = "0.0.0.0:8000"
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+
+def on_starting(server):
+    # Build the simplifier in the master so forked workers inherit the compiled
+    # rules copy-on-write instead of each reloading and recompiling them.
+    get_simplifier(CONFIG_PATH)
@@ -11,10 +11,15 @@ from __future__ import annotations
 import argparse
 import json
 from pathlib import Path
-from typing import Any, List, MutableMapping, MutableSequence
+from typing import Any, List, MutableMapping, MutableSequence, Tuple
 
 from simplifier import EmailSimplifier
 
+try:
+    import orjson
+except ImportError:  # optional accelerator: pip install orjson
+    orjson = None
+
 
 class JsonSimplifier:
     """Apply the EmailSimplifier to JSON payloads.
@@ -37,27 +42,39 @@ class JsonSimplifier:
         self.output_field = output_field
 
     def simplify_payload(self, payload: Any) -> Any:
-        """Simplify every template inside the provided JSON payload."""
-        if isinstance(payload, MutableSequence):
-            return [self._simplify_entry(entry) for entry in payload]
-        if isinstance(payload, MutableMapping):
-            return {k: self.simplify_payload(v) if self._is_container(v) else v for k, v in payload.items()}  # type: ignore[return-value]
+        """Simplify every template inside the provided JSON payload.
+
+        The payload is updated in place and returned; containers are never copied.
+        All template texts are simplified together in one batch.
+        """
+        entries: List[MutableMapping[str, Any]] = []
+        self._collect_entries(payload, entries)
+        texts = [self._entry_text(entry) for entry in entries]
+        for entry, simplified in zip(entries, self.simplifier.simplify_batch(texts)):
+            entry[self.output_field] = simplified
         return payload
 
-    def _is_container(self, value: Any) -> bool:
-        return isinstance(value, (MutableSequence, MutableMapping))
-
-    def _simplify_entry(self, entry: Any) -> Any:
-        """Simplify one entry if it looks like a template object."""
-        if isinstance(entry, MutableMapping) and self.text_field in entry:
-            original = entry[self.text_field]
-            if not isinstance(original, str):
-                raise TypeError(f"Expected '{self.text_field}' to be a string, got {type(original).__name__}")
-            entry[self.output_field] = self.simplifier.simplify_text(original)
-            return entry
-        if isinstance(entry, MutableSequence):
-            return [self._simplify_entry(item) for item in entry]
-        return entry
+    def _collect_entries(self, payload: Any, entries: List[MutableMapping[str, Any]]) -> None:
+        # Iterative walk: no recursion limit on deeply nested payloads and no frame per container.
+        text_field = self.text_field
+        containers = (MutableSequence, MutableMapping)
+        stack = [payload]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, MutableMapping):
+                stack.extend(v for v in node.values() if isinstance(v, containers))
+            elif isinstance(node, MutableSequence):
+                for item in node:
+                    if isinstance(item, MutableMapping) and text_field in item:
+                        entries.append(item)
+                    elif isinstance(item, containers):
+                        stack.append(item)
+
+    def _entry_text(self, entry: MutableMapping[str, Any]) -> str:
+        original = entry[self.text_field]
+        if not isinstance(original, str):
+            raise TypeError(f"Expected '{self.text_field}' to be a string, got {type(original).__name__}")
+        return original
 
 
 def convert_json(
@@ -75,18 +92,38 @@ def convert_json(
         output_field=output_field,
     )
 
-    payload = _load_json(input_path)
+    payload, has_non_finite = _load_json(input_path)
     simplified = converter.simplify_payload(payload)
-    _write_json(output_path, simplified)
+    _write_json(output_path, simplified, use_orjson=not has_non_finite)
+
+
+def _load_json(path: str) -> Tuple[Any, bool]:
+    """Parse with the stdlib, which keeps big ints exact and accepts NaN/Infinity.
+
+    Also reports whether any NaN/Infinity constant was seen, since orjson would
+    silently write those as ``null``.
+    """
+    non_finite: List[str] = []
 
+    def parse_constant(name: str) -> float:
+        non_finite.append(name)
+        return float(name)
 
-def _load_json(path: str) -> Any:
     with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
+        return json.load(f, parse_constant=parse_constant), bool(non_finite)
 
 
-def _write_json(path: str, payload: Any) -> None:
+def _write_json(path: str, payload: Any, *, use_orjson: bool = True) -> None:
     Path(path).parent.mkdir(parents=True, exist_ok=True)
+    if orjson is not None and use_orjson:
+        try:
+            data = orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            pass  # e.g. integers wider than 64 bits; the stdlib writes them exactly
+        else:
+            with open(path, "wb") as f:
+                f.write(data)
+            return
     with open(path, "w", encoding="utf-8") as f:
         json.dump(payload, f, indent=2, ensure_ascii=False)
 
@@ -1,9 +1,187 @@
 import re
 import os
+import json
+import tempfile
+import functools
+import threading
 import yaml
-from typing import Dict, Any, List
+from collections import OrderedDict
+from typing import Dict, Any, Iterator, List, Optional, Pattern, Tuple
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
+
+try:
+    import ahocorasick
+except ImportError:  # optional accelerator: pip install pyahocorasick
+    ahocorasick = None
+
+try:
+    import hyperscan
+except ImportError:  # optional accelerator (x86 Linux): pip install hyperscan
+    hyperscan = None
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def _at_word_boundary(text: str, i: int) -> bool:
+    """Mirror regex ``\\b`` semantics at index ``i`` of ``text``."""
+    before = i > 0 and _is_word_char(text[i - 1])
+    after = i < len(text) and _is_word_char(text[i])
+    return before != after
+
+
+# Joins batch inputs into one buffer. NUL is neither a word character nor
+# whitespace, so word-boundary and literal rules never match across it.
+_BATCH_SEPARATOR = "\x00"
+
+
+class _LiteralReplacer:
+    """Case-insensitive replacement of literal keys in a single pass.
+
+    Each rule is ``(key, replacement, whole_word)``; whole-word rules only match
+    between regex ``\\b`` boundaries. The text is lowercased once and scanned
+    case-sensitively against lowercase keys, using the fastest engine available:
+    a hyperscan database for ASCII text, then a pyahocorasick automaton, then one
+    compiled regex alternation. Unmatched spans are sliced from the original
+    text. Every engine resolves overlapping matches leftmost-longest, and for
+    rules with the same key the earlier rule wins.
+    """
+
+    def __init__(self, rules: List[Tuple[str, str, bool]]) -> None:
+        self.rules: List[Tuple[str, str, bool]] = []
+        seen = set()
+        for key, value, whole_word in rules:
+            key = key.lower()
+            if key and (key, whole_word) not in seen:
+                seen.add((key, whole_word))
+                self.rules.append((key, value, whole_word))
+        self.pattern: Optional[Pattern[str]] = None
+        self.folded_pattern: Optional[Pattern[str]] = None
+        self.automaton: Any = None
+        self.hs_db: Any = None
+        self._hs_local = threading.local()
+        if not self.rules:
+            return
+
+        # Longest keys first (stable, so earlier rules keep precedence), one group per rule.
+        order = sorted(range(len(self.rules)), key=lambda i: -len(self.rules[i][0]))
+        alternatives = []
+        for i in order:
+            key, _, whole_word = self.rules[i]
+            alternatives.append(rf"\b({re.escape(key)})\b" if whole_word else f"({re.escape(key)})")
+        self._group_values = [self.rules[i][1] for i in order]
+        self.pattern = re.compile("|".join(alternatives), re.IGNORECASE)
+        self.folded_pattern = re.compile("|".join(alternatives))
+
+        if ahocorasick is not None:
+            candidates: Dict[str, List[Tuple[int, str, bool]]] = {}
+            for priority, (key, value, whole_word) in enumerate(self.rules):
+                candidates.setdefault(key, []).append((priority, value, whole_word))
+            self.automaton = ahocorasick.Automaton()
+            for key, entries in candidates.items():
+                self.automaton.add_word(key, (len(key), entries))
+            self.automaton.make_automaton()
+        if hyperscan is not None:
+            self._build_hyperscan()
+
+    def _build_hyperscan(self) -> None:
+        # Only ASCII keys can match the ASCII texts this engine is used for.
+        ids = [i for i, (key, _, _) in enumerate(self.rules) if key.isascii()]
+        if not ids:
+            return
+        self.hs_db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+        self.hs_db.compile(
+            expressions=[re.escape(self.rules[i][0]).encode("ascii") for i in ids],
+            ids=ids,
+            elements=len(ids),
+            flags=[hyperscan.HS_FLAG_SOM_LEFTMOST] * len(ids),
+        )
+
+    def sub(self, text: str) -> str:
+        if self.pattern is None:
+            return text
+        lower = text.lower()
+        # Unicode lowercasing can change the length; spans must line up with ``text``.
+        if len(lower) != len(text):
+            values = self._group_values
+            return self.pattern.sub(lambda m: values[m.lastindex - 1], text)
+        if self.hs_db is not None and text.isascii():
+            return self._sub_hyperscan(text, lower)
+        if self.automaton is not None:
+            return self._sub_automaton(text, lower)
+        return self._sub_folded(text, lower)
+
+    def _sub_folded(self, text: str, lower: str) -> str:
+        values = self._group_values
+        out: List[str] = []
+        pos = 0
+        for m in self.folded_pattern.finditer(lower):
+            start, end = m.span()
+            out.append(text[pos:start])
+            out.append(values[m.lastindex - 1])
+            pos = end
+        if not out:
+            return text
+        out.append(text[pos:])
+        return "".join(out)
+
+    def _sub_automaton(self, text: str, lower: str) -> str:
+        matches = []
+        for end, (length, entries) in self.automaton.iter(lower):
+            start = end - length + 1
+            for priority, value, whole_word in entries:
+                if not whole_word or (_at_word_boundary(text, start) and _at_word_boundary(text, end + 1)):
+                    matches.append((start, -length, priority, value))
+                    break
+        return _splice(text, matches)
+
+    def _sub_hyperscan(self, text: str, lower: str) -> str:
+        # Scratch space cannot be shared between concurrent scans; keep one per thread.
+        scratch = getattr(self._hs_local, "scratch", None)
+        if scratch is None:
+            scratch = self._hs_local.scratch = hyperscan.Scratch(self.hs_db)
+        rules = self.rules
+        matches = []
+
+        def on_match(rule_id: int, start: int, end: int, flags: int, context: Any) -> None:
+            _, value, whole_word = rules[rule_id]
+            if not whole_word or (_at_word_boundary(text, start) and _at_word_boundary(text, end)):
+                matches.append((start, start - end, rule_id, value))
+
+        self.hs_db.scan(lower.encode("ascii"), match_event_handler=on_match, scratch=scratch)
+        return _splice(text, matches)
+
+
+def _splice(text: str, matches: List[Tuple[int, int, int, str]]) -> str:
+    """Apply ``(start, -length, priority, value)`` matches, keeping leftmost-longest, then highest priority."""
+    if not matches:
+        return text
+    matches.sort()
+    out: List[str] = []
+    pos = 0
+    for start, neg_length, _, value in matches:
+        if start < pos:
+            continue
+        out.append(text[pos:start])
+        out.append(value)
+        pos = start - neg_length
+    out.append(text[pos:])
+    return "".join(out)
+
 
 class EmailSimplifier:
+    # Results for repeated inputs (shared template boilerplate) are memoised per
+    # instance and FIFO-evicted. Only boilerplate-sized texts are cached, and the
+    # total characters held (inputs plus results) is capped at about 1M.
+    cache_size = 4096
+    cache_max_text_length = 2048
+    cache_max_chars = 1 << 20
+
     def __init__(self, config_path: str = "config.yaml") -> None:
         self.config = self._load_config(config_path)
         self.jargon_map: Dict[str, str] = self.config.get("jargon_map", {})
@@ -12,49 +190,151 @@ class EmailSimplifier:
         self.kyc_documents: Dict[str, str] = self.config.get("kyc_documents", {})
         self.sentence_length_limit: int = self.config.get("sentence_length_limit", 22)
 
+        # Every literal rule is applied in one scan. Where keys overlap, the leftmost-longest
+        # match wins; identical keys keep the old stage order (words, patterns, documents).
+        # Keys are lowercased while merging so a later entry (tone over jargon) wins over
+        # an earlier one that differs only in case, as it did with the per-map lookups.
+        self._word_map: Dict[str, str] = {k.lower(): v for k, v in {**self.jargon_map, **self.tone_map}.items()}
+        kyc_doc_map = {k.lower(): v for k, v in self.kyc_documents.items()}
+        rules = [(k, v, True) for k, v in self._word_map.items()]
+        rules += [(p["search"], self._expand_replacement(p), False) for p in self.patterns]
+        rules += [(k, v, True) for k, v in kyc_doc_map.items()]
+        self._replacer = _LiteralReplacer(rules)
+        self._sentence_split_re = re.compile(r"(?<=[.!?])\s+")
+        # Replacements that are empty or padded can leave whitespace runs behind; with
+        # the default rules the text stays single-spaced and needs no second pass.
+        self._needs_ws_cleanup = any(not r or r != " ".join(r.split()) for _, r, _ in self._replacer.rules)
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._cache_chars = 0
+        self._cache_lock = threading.Lock()
+
+    @staticmethod
+    def _expand_replacement(pattern: Dict[str, str]) -> str:
+        """Resolve the ``re.sub`` template of a pattern rule to the literal text it produces."""
+        search = pattern["search"]
+        return re.sub(re.escape(search), pattern["replace"], search, count=1)
+
     @staticmethod
     def _load_config(path: str) -> Dict[str, Any]:
+        """Load the YAML rules, reusing a JSON cache written next to the file when it is fresh.
+
+        The cache records the config's ``st_mtime_ns`` and ``st_size`` and is only used
+        on an exact match, so same-second edits and restored older files are re-parsed.
+        """
+        cache_path = path + ".cache.json"
+        st = os.stat(path)
+        source = {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            if isinstance(cached, dict) and cached.get("source") == source:
+                return cached["config"]
+        except (OSError, ValueError, KeyError):
+            pass
+
         with open(path, "r") as f:
-            return yaml.safe_load(f) or {}
+            config = yaml.load(f, Loader=SafeLoader) or {}
+
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump({"source": source, "config": config}, f)
+                # mkstemp creates 0600; other users running the API or bulk jobs must be able to read it.
+                os.chmod(tmp_path, 0o644)
+                os.replace(tmp_path, cache_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except (OSError, TypeError, ValueError):
+            pass  # the cache is best-effort; an unwritable directory or non-JSON YAML just skips it
+        return config
 
     def simplify_text(self, text: str) -> str:
         if not text: return text
-        text = re.sub(r"\s+", " ", text).strip()
-
-        text = self._apply_word_map(text, self.jargon_map)
-        text = self._apply_word_map(text, self.tone_map)
-        text = self._apply_patterns(text, self.patterns)
-        text = self._apply_kyc_doc_rules(text)
-        text = self._rewrite_sentences(text)
-        text = re.sub(r"\s+", " ", text).strip()
-        return text
+        cached = self._cache.get(text)
+        if cached is not None:
+            return cached
+        result = self._simplify_uncached(text)
+        self._remember(text, result)
+        return result
 
-    def _apply_word_map(self, text: str, mapping: Dict[str, str]) -> str:
-        for raw, simple in mapping.items():
-            text = re.sub(rf"\b{re.escape(raw)}\b", simple, text, flags=re.IGNORECASE)
-        return text
+    def simplify_batch(self, texts: List[str]) -> List[str]:
+        """Simplify many texts, running the replacement pass once over a joined buffer.
 
-    def _apply_patterns(self, text: str, patterns: List[Dict[str, str]]) -> str:
-        for p in patterns:
-            text = re.sub(re.escape(p["search"]), p["replace"], text, flags=re.IGNORECASE)
-        return text
+        Cached and duplicate inputs are only simplified once.
+        """
+        cache = self._cache
+        results: List[Optional[str]] = [cache.get(t) if t else t for t in texts]
+        pending = list(dict.fromkeys(t for t, r in zip(texts, results) if r is None))
+        if not pending:
+            return results  # type: ignore[return-value]
+        simplified = dict(zip(pending, self._simplify_batch_uncached(pending)))
+        for text, result in simplified.items():
+            self._remember(text, result)
+        return [simplified[t] if r is None else r for t, r in zip(texts, results)]
 
-    def _apply_kyc_doc_rules(self, text: str) -> str:
-        for raw, friendly in self.kyc_documents.items():
-            text = re.sub(rf"\b{re.escape(raw)}\b", friendly, text, flags=re.IGNORECASE)
-        return text
+    def _remember(self, text: str, result: str) -> None:
+        size = len(text) + len(result)
+        if len(text) > self.cache_max_text_length or size > self.cache_max_chars:
+            return
+        # The API simplifies batches on a threadpool; keep the size accounting consistent.
+        with self._cache_lock:
+            cache = self._cache
+            if text in cache:
+                return
+            cache[text] = result
+            self._cache_chars += size
+            while len(cache) > self.cache_size or self._cache_chars > self.cache_max_chars:
+                old_text, old_result = cache.popitem(last=False)
+                self._cache_chars -= len(old_text) + len(old_result)
+
+    def _simplify_uncached(self, text: str) -> str:
+        # str.split() uses the same whitespace set as regex \s without going through the regex engine.
+        text = " ".join(text.split())
+
+        text = self._replacer.sub(text)
+        if self._needs_ws_cleanup:
+            text = " ".join(text.split())
+        return self._rewrite_sentences(text)
+
+    def _simplify_batch_uncached(self, texts: List[str]) -> List[str]:
+        normalized = [" ".join(t.split()) if t else "" for t in texts]
+        joined = _BATCH_SEPARATOR.join(normalized)
+        if joined.count(_BATCH_SEPARATOR) != len(texts) - 1:
+            return [self._simplify_uncached(t) if t else t for t in texts]
+
+        joined = self._replacer.sub(joined)
+        parts = joined.split(_BATCH_SEPARATOR)
+        if len(parts) != len(texts):
+            return [self._simplify_uncached(t) if t else t for t in texts]
+
+        if self._needs_ws_cleanup:
+            parts = [" ".join(part.split()) for part in parts]
+        rewrite = self._rewrite_sentences
+        return [rewrite(part) if original else original for original, part in zip(texts, parts)]
 
     def _rewrite_sentences(self, text: str) -> str:
-        sentences = re.split(r"(?<=[.!?])\s+", text)
-        cleaned = []
-        for s in sentences:
-            s = s.strip()
-            if not s: continue
-            if len(s.split()) > self.sentence_length_limit and "," in s:
-                parts = [p.strip() for p in s.split(",")]
-                cleaned.append(parts[0] + ".")
-                if len(parts) > 1:
-                    cleaned.append(", ".join(parts[1:]) + ".")
-                continue
-            cleaned.append(s if s.endswith(('.', '?', '!')) else s + ".")
-        return " ".join(cleaned)
+        limit = self.sentence_length_limit
+
+        def sentences() -> Iterator[str]:
+            for s in self._sentence_split_re.split(text):
+                s = s.strip()
+                if not s: continue
+                # Sentences are single-spaced here, so spaces + 1 is the word count.
+                if s.count(" ") + 1 > limit and "," in s:
+                    head, _, rest = s.partition(",")
+                    yield head.rstrip() + "."
+                    rest = rest.strip()
+                    if rest:
+                        yield rest if rest[-1] in ".?!" else rest + "."
+                    continue
+                yield s if s[-1] in ".?!" else s + "."
+
+        return " ".join(sentences())
+
+
+@functools.lru_cache(maxsize=None)
+def get_simplifier(config_path: str = "config.yaml") -> EmailSimplifier:
+    """Return a shared EmailSimplifier for ``config_path``, building it on first use."""
+    return EmailSimplifier(config_path)
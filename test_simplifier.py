@@ -0,0 +1,207 @@
+"""Guardrail and engine-equivalence tests. Run with ``python -m unittest``."""
+import inspect
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+import yaml
+
+import json_convert
+import simplifier
+from simplifier import EmailSimplifier, _LiteralReplacer, _splice, _at_word_boundary
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.yaml")
+
+RULES = [
+    ("ab", "X", True),
+    ("Abc", "Y", True),
+    ("b c", "Z", True),
+    ("c", "W", True),
+    ("/x", "S", True),
+    ("a_b", "U", True),
+    ("a-b", "D", True),
+    ("bc", "P", False),
+    ("ab", "Q", False),
+    ("AB", "dup", True),
+    ("c.", "R", False),
+    ("é", "E", True),
+]
+
+
+def _is_numba_compiled(obj):
+    return hasattr(obj, "__numba_compiled__") or type(obj).__module__.split(".")[0] == "numba"
+
+
+def _reference_sub(replacer, text):
+    """Brute-force leftmost-longest replacement used as the oracle for every engine."""
+    lower = text.lower()
+    matches = []
+    for priority, (key, value, whole_word) in enumerate(replacer.rules):
+        i = lower.find(key)
+        while i != -1:
+            if not whole_word or (_at_word_boundary(text, i) and _at_word_boundary(text, i + len(key))):
+                matches.append((i, -len(key), priority, value))
+            i = lower.find(key, i + 1)
+    return _splice(text, matches)
+
+
+class NoNumbaTest(unittest.TestCase):
+    """String/regex code runs slower under Numba's object mode; see CONTRIBUTING.md."""
+
+    def test_module_symbols_are_not_numba_compiled(self):
+        for name, obj in vars(simplifier).items():
+            with self.subTest(name=name):
+                self.assertFalse(_is_numba_compiled(obj))
+
+    def test_class_members_are_not_numba_compiled(self):
+        for cls in (EmailSimplifier, _LiteralReplacer):
+            for name, obj in inspect.getmembers(cls):
+                with self.subTest(cls=cls.__name__, name=name):
+                    self.assertFalse(_is_numba_compiled(obj))
+
+
+class LiteralReplacerEngineTest(unittest.TestCase):
+    def setUp(self):
+        self.replacer = _LiteralReplacer(RULES)
+        self.rng = random.Random(1)
+
+    def _random_texts(self, alphabet, count=3000):
+        for _ in range(count):
+            yield "".join(self.rng.choice(alphabet) for _ in range(self.rng.randint(0, 15)))
+
+    def test_regex_engines_match_reference(self):
+        values = self.replacer._group_values
+        for text in self._random_texts("abcABC _/x.-é"):
+            expected = _reference_sub(self.replacer, text)
+            self.assertEqual(self.replacer.pattern.sub(lambda m: values[m.lastindex - 1], text), expected, text)
+            self.assertEqual(self.replacer._sub_folded(text, text.lower()), expected, text)
+
+    @unittest.skipIf(simplifier.ahocorasick is None, "pyahocorasick not installed")
+    def test_automaton_matches_reference(self):
+        for text in self._random_texts("abcABC _/x.-é"):
+            self.assertEqual(self.replacer._sub_automaton(text, text.lower()), _reference_sub(self.replacer, text), text)
+
+    @unittest.skipIf(simplifier.hyperscan is None, "hyperscan not installed")
+    def test_hyperscan_matches_reference(self):
+        for text in self._random_texts("abcABC _/x.-"):
+            self.assertEqual(self.replacer._sub_hyperscan(text, text.lower()), _reference_sub(self.replacer, text), text)
+
+
+def _write_config(directory, config):
+    path = os.path.join(directory, "config.yaml")
+    with open(path, "w", encoding="utf-8") as f:
+        yaml.safe_dump(config, f)
+    return path
+
+
+class ConfigCacheTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = _write_config(tmp.name, {"sentence_length_limit": 24})
+        self.cache_path = self.path + ".cache.json"
+        self.assertEqual(EmailSimplifier(self.path).sentence_length_limit, 24)
+        self.assertTrue(os.path.exists(self.cache_path))
+
+    def test_edit_with_same_mtime_as_cache_invalidates_it(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("sentence_length_limit: 5\n")
+        cache_stat = os.stat(self.cache_path)
+        os.utime(self.path, ns=(cache_stat.st_atime_ns, cache_stat.st_mtime_ns))
+        self.assertEqual(EmailSimplifier(self.path).sentence_length_limit, 5)
+
+    def test_restored_older_config_invalidates_cache(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("sentence_length_limit: 7\n")
+        os.utime(self.path, ns=(10**9, 10**9))
+        self.assertEqual(EmailSimplifier(self.path).sentence_length_limit, 7)
+
+    def test_cache_is_world_readable(self):
+        self.assertEqual(os.stat(self.cache_path).st_mode & 0o777, 0o644)
+
+
+class JsonRoundTripTest(unittest.TestCase):
+    def _convert(self, source):
+        with tempfile.TemporaryDirectory() as tmp:
+            config_path = _write_config(tmp, {"tone_map": {"submit": "share"}})
+            input_path = os.path.join(tmp, "in.json")
+            output_path = os.path.join(tmp, "out.json")
+            with open(input_path, "w", encoding="utf-8") as f:
+                f.write(source)
+            json_convert.convert_json(input_path, output_path, config_path=config_path)
+            with open(output_path, "r", encoding="utf-8") as f:
+                return f.read()
+
+    def test_integers_wider_than_64_bits_stay_exact(self):
+        output = self._convert('{"big": 123456789012345678901234567890, "t": [{"text": "submit"}]}')
+        self.assertIn('"big": 123456789012345678901234567890', output)
+        self.assertIn('"simplified_text": "share."', output)
+
+    def test_nan_and_infinity_survive(self):
+        output = self._convert('{"a": NaN, "b": -Infinity, "c": Infinity, "t": [{"text": "submit"}]}')
+        for expected in ('"a": NaN', '"b": -Infinity', '"c": Infinity', '"simplified_text": "share."'):
+            self.assertIn(expected, output)
+
+
+class WordMapPrecedenceTest(unittest.TestCase):
+    def test_tone_overrides_case_variant_jargon_key(self):
+        config = {
+            "jargon_map": {"Submit": "SEND", "furnish": "GIVE"},
+            "tone_map": {"submit": "share", "furnish": "provide"},
+        }
+        with tempfile.TemporaryDirectory() as tmp:
+            email_simplifier = EmailSimplifier(_write_config(tmp, config))
+            self.assertEqual(email_simplifier.simplify_text("submit and furnish"), "share and provide.")
+
+
+class EmailSimplifierTest(unittest.TestCase):
+    WORDS = ["submit", "DB", "Periodic", "Review", "upload", "certificate", "of", "incorporation", ",", ".", "!", "asap", "  ", "\n"]
+
+    def setUp(self):
+        # Work on a copy so the config cache is not written next to the repo's config.yaml.
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.config_path = shutil.copy(CONFIG_PATH, tmp.name)
+        self.simplifier = EmailSimplifier(self.config_path)
+
+    def _texts(self, seed, count=300):
+        rng = random.Random(seed)
+        texts = ["", "   ", "a", "DB", "Upload? uploaded"]
+        return texts + [" ".join(rng.choice(self.WORDS) for _ in range(rng.randint(0, 40))) for _ in range(count)]
+
+    def _expected(self, texts):
+        fresh = EmailSimplifier(self.config_path)
+        return [fresh.simplify_text(t) for t in texts]
+
+    def test_batch_matches_single_calls(self):
+        texts = self._texts(0)
+        self.assertEqual(self.simplifier.simplify_batch(texts), self._expected(texts))
+
+    def test_batch_with_mixed_cache_hits_matches_single_calls(self):
+        texts = self._texts(1)
+        for text in texts[::3]:
+            self.simplifier.simplify_text(text)
+        texts += texts[::2]  # repeats within the batch
+        self.assertEqual(self.simplifier.simplify_batch(texts), self._expected(texts))
+
+    def test_memo_is_bounded_by_total_characters(self):
+        self.simplifier.cache_max_chars = 10000
+        for i in range(100):
+            self.simplifier.simplify_text(f"template {i} " + "x" * 500)
+        self.simplifier.simplify_text("y" * (self.simplifier.cache_max_text_length + 1))
+        held = sum(len(k) + len(v) for k, v in self.simplifier._cache.items())
+        self.assertEqual(held, self.simplifier._cache_chars)
+        self.assertLessEqual(held, 10000)
+        self.assertTrue(all(len(k) <= self.simplifier.cache_max_text_length for k in self.simplifier._cache))
+
+    def test_simplify_text(self):
+        self.assertEqual(
+            self.simplifier.simplify_text("Please submit the DB form"),
+            "Please share the external verification database form.",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()